@@ -13,10 +13,10 @@ The two main entry points into the :class:`.ExpFragment` universe are
 from artiq.language import (EnvExperiment, HasEnvironment, kernel, portable, PYONValue,
                             rpc, TerminationRequested)
 from artiq.coredevice.exceptions import RTIOUnderflow
-from collections import OrderedDict
+from collections import defaultdict
 from collections.abc import Callable, Iterable
 from contextlib import suppress
-from functools import reduce
+import functools
 import logging
 import random
 import time
@@ -99,13 +99,12 @@ class FragmentScanExperiment(EnvExperiment):
         """Collect parameters to set from both scan axes and simple overrides, and
         initialise result channels.
         """
-        param_stores = self.args.make_override_stores()
+        param_stores = defaultdict(list, self.args.make_override_stores())
 
         spec, no_axes_mode, skip_on_persistent_transitory_error = (
             self.args.make_scan_spec())
         for ax in spec.axes:
-            fqn = ax.param_schema["fqn"]
-            param_stores.setdefault(fqn, []).append((ax.path, ax.param_store))
+            param_stores[ax.param_schema["fqn"]].append((ax.path, ax.param_store))
 
         self.fragment.init_params(param_stores)
 
@@ -132,8 +131,13 @@ class FragmentScanExperiment(EnvExperiment):
             max_transitory_error_retries=self.max_transitory_error_retries,
             skip_on_persistent_transitory_error=skip_on_persistent_transitory_error)
 
+    #: Pretty name to use for the applet title; resolved lazily from the fragment
+    #: class docstring unless already set at class scope (see
+    #: :meth:`make_fragment_scan_exp`).
+    _pretty_name: str | None = None
+
     def run(self):
-        name = get_class_pretty_name(self.fragment.__class__)
+        name = self._pretty_name or get_class_pretty_name(self.fragment.__class__)
         self.tlr.create_applet(title=f"{name} ({self.fragment.fqn})")
         with suppress(TerminationRequested):
             self.tlr.run()
@@ -155,13 +159,13 @@ class ArgumentInterface(HasEnvironment):
 
             for handle in fragment.get_always_shown_params():
                 path = handle.owner._stringize_path()
-                try:
-                    param = handle.owner._free_params[handle.name]
-                    always_shown_params += [(param.fqn, path)]
-                except KeyError:
+                param = handle.owner._free_params.get(handle.name, None)
+                if param is None:
                     logger.warning(
                         "Parameter '%s' specified in get_always_shown_params()"
                         " is not a free parameter of fragment '%s'", handle.name, path)
+                    continue
+                always_shown_params.append((param.fqn, path))
 
         desc = {
             "instances": instances,
@@ -178,11 +182,39 @@ class ArgumentInterface(HasEnvironment):
             }
         self._params = self.get_argument(PARAMS_ARG_KEY, PYONValue(default=desc))
 
+        # Cache store types and parsed PYON values across make_override_stores()/
+        # make_scan_spec() invocations, as experiments can be re-prepared (e.g. after a
+        # pause), and many overrides tend to share the same FQN/value.
+        self._store_type_cache: dict[str, type[ParamStore]] = {}
+        self._pyon_value_cache: dict[tuple[str, str], Any] = {}
+        self._value_from_pyon_cache: dict[type[ParamStore], Callable[[Any], Any]] = {}
+
+    def _get_store_type(self, fqn: str) -> type[ParamStore]:
+        store_type = self._store_type_cache.get(fqn, None)
+        if store_type is None:
+            store_type = self._sample_instances[fqn].StoreType
+            self._store_type_cache[fqn] = store_type
+        return store_type
+
+    def _value_from_pyon(self, store_type: type[ParamStore], fqn: str,
+                         value: Any) -> Any:
+        key = (fqn, repr(value))
+        if key in self._pyon_value_cache:
+            return self._pyon_value_cache[key]
+        # Resolving the classmethod through the descriptor protocol is not free either,
+        # so keep the bound parser around per store type (many overrides/axes tend to
+        # share a handful of types).
+        parse = self._value_from_pyon_cache.setdefault(store_type,
+                                                       store_type.value_from_pyon)
+        result = parse(value)
+        self._pyon_value_cache[key] = result
+        return result
+
     def make_override_stores(self) -> dict[str, tuple[str, ParamStore]]:
         stores = {}
         for fqn, specs in self._params.get("overrides", {}).items():
             try:
-                store_type = self._sample_instances[fqn].StoreType
+                store_type = self._get_store_type(fqn)
             except KeyError:
                 raise KeyError("Experiment does not have parameters matching "
                                f"overrride for FQN '{fqn}' " +
@@ -190,7 +222,8 @@ class ArgumentInterface(HasEnvironment):
                                "changes to experiment; try Recompute All Arguments)")
             stores[fqn] = [(s["path"],
                             store_type((fqn, s["path"]),
-                                       store_type.value_from_pyon(s["value"])))
+                                       self._value_from_pyon(store_type, fqn,
+                                                             s["value"])))
                            for s in specs]
         return stores
 
@@ -211,14 +244,15 @@ class ArgumentInterface(HasEnvironment):
             pathspec = axspec["path"]
 
             try:
-                store_type = self._sample_instances[fqn].StoreType
+                store_type = self._get_store_type(fqn)
             except KeyError:
                 raise KeyError("Experiment does not have parameters matching "
                                f"scan axis with FQN '{fqn}' " +
                                "(likely due to outdated argument editor after " +
                                "changes to experiment; try Recompute All Arguments)")
             first_value = generator.points_for_level(0, random)[0]
-            store = store_type((fqn, pathspec), store_type.value_from_pyon(first_value))
+            store = store_type((fqn, pathspec),
+                               self._value_from_pyon(store_type, fqn, first_value))
             axes.append(ScanAxis(self._schemata[fqn], pathspec, store))
 
         options = ScanOptions(scan.get("num_repeats", 1),
@@ -245,6 +279,7 @@ class TopLevelRunner(HasEnvironment):
         self.max_rtio_underflow_retries = max_rtio_underflow_retries
         self.max_transitory_error_retries = max_transitory_error_retries
         self.skip_on_persistent_transitory_error = skip_on_persistent_transitory_error
+        self._run_once_is_kernel = is_kernel(fragment.run_once)
 
         self.setattr_device("ccb")
         self.setattr_device("core")
@@ -259,6 +294,18 @@ class TopLevelRunner(HasEnvironment):
             dataset_prefix += "."
         self.dataset_prefix = dataset_prefix
 
+        # Precompute dataset keys used outside build() so no string concatenation is
+        # left on the per-point/completion paths (_finish_continuous_point() is an
+        # async RPC invoked for every point).
+        self._ds_point_phase = dataset_prefix + "point_phase"
+        self._ds_completed = dataset_prefix + "completed"
+        self._ds_annotations = dataset_prefix + "annotations"
+
+        # Metadata values already broadcast (keys relative to the dataset prefix), so
+        # unchanged entries can be skipped when the metadata is pushed again, e.g.
+        # after resuming from a pause.
+        self._last_pushed: dict[str, Any] = {}
+
         # FIXME: We save these as individual booleans as enums crash the ARTIQ compiler.
         self._continue_running = False
         self._is_time_series = False
@@ -280,6 +327,12 @@ class TopLevelRunner(HasEnvironment):
                 }
                 self.spec.axes = [ScanAxis(param_schema, "*", None)]
 
+        # Dataset names for the per-axis coordinate sinks, precomputed here so run()
+        # does not redo the string formatting on every invocation.
+        self._coordinate_sink_names = [
+            dataset_prefix + f"points.axis_{i}" for i in range(len(self.spec.axes))
+        ]
+
         # Initialise result channels.
         chan_dict = {}
         self.fragment._collect_result_channels(chan_dict)
@@ -302,14 +355,20 @@ class TopLevelRunner(HasEnvironment):
             channel.set_sink(sink)
             self._scan_result_sinks[channel] = sink
 
+        # Fixed (channel, sink) pairs for iteration on the result-collection paths,
+        # avoiding repeated dict view construction.
+        self._scan_result_pairs = tuple(self._scan_result_sinks.items())
+
         # Filter analyses, set up analysis result channels, and keep track of all the
         # names in the annotation context.
         self._analyses = [] if self._is_time_series else filter_default_analyses(
             self.fragment, self.spec.axes)
 
-        self._analysis_results = reduce(
-            lambda x, y: merge_no_duplicates(x, y, kind="analysis result"),
-            (a.get_analysis_results() for a in self._analyses), {})
+        self._analysis_results = {}
+        for a in self._analyses:
+            merge_no_duplicates(self._analysis_results,
+                                a.get_analysis_results(),
+                                kind="analysis result")
         for name, channel in self._analysis_results.items():
             channel.set_sink(
                 ScalarDatasetSink(self,
@@ -318,26 +377,50 @@ class TopLevelRunner(HasEnvironment):
         axis_indices = {}
         for i, axis in enumerate(self.spec.axes):
             axis_indices[(axis.param_schema["fqn"], axis.path)] = i
+        # Passing the dict lookups as bound methods rather than lambdas avoids a
+        # Python-level stack frame per annotation coordinate/channel resolved. (The
+        # callback-based AnnotationContext interface itself is kept, as other users –
+        # e.g. subscans – need non-trivial callbacks.)
         self._annotation_context = AnnotationContext(
             lambda handle: axis_indices[handle._store.identity],
-            lambda channel: self._short_child_channel_names[channel],
-            lambda channel: True)
+            self._short_child_channel_names.__getitem__, lambda channel: True)
 
         self._coordinate_sinks = None
+        self._coordinate_dict_cache = None
 
         self.fragment.prepare()
 
+        # The scan description is fixed once the fragment tree has been prepared, so
+        # derive the serialised (HDF5-compatible) dataset values once here rather than
+        # on every _broadcast_metadata() call; this also moves the JSON string
+        # generation into the prepare pipeline stage.
+        self._scan_desc = describe_scan(self.spec, self.fragment,
+                                        self._short_child_channel_names)
+        self._scan_desc.update(
+            describe_analyses(self._analyses, self._annotation_context))
+        self._scan_desc["analysis_results"] = {
+            name: channel.describe()
+            for name, channel in self._analysis_results.items()
+        }
+        self._serialized_scan_desc = {}
+        for name, value in self._scan_desc.items():
+            # Flatten arrays/dictionaries to JSON strings for HDF5 compatibility.
+            ds_value = to_metadata_broadcast_type(value)
+            self._serialized_scan_desc[name] = (dump_json(value)
+                                                if ds_value is None else ds_value)
+
     def run(self):
         """Run the (possibly trivial) scan."""
+        self._coordinate_dict_cache = None
         self._broadcast_metadata()
 
         if not self.spec.axes and not self._is_time_series:
             self._run_continuous()
-            return None, {c: s.get_last() for c, s in self._scan_result_sinks.items()}
+            return None, {c: s.get_last() for c, s in self._scan_result_pairs}
 
         if self._is_time_series:
-            self._timestamp_sink = AppendingDatasetSink(
-                self, self.dataset_prefix + "points.axis_0")
+            self._timestamp_sink = AppendingDatasetSink(self,
+                                                        self._coordinate_sink_names[0])
             self._coordinate_sinks = [self._timestamp_sink]
             self._time_series_start = time.monotonic()
             self._run_continuous()
@@ -349,8 +432,7 @@ class TopLevelRunner(HasEnvironment):
                 skip_on_persistent_transitory_error=self.
                 skip_on_persistent_transitory_error)
             self._coordinate_sinks = [
-                AppendingDatasetSink(self, self.dataset_prefix + f"points.axis_{i}")
-                for i in range(len(self.spec.axes))
+                AppendingDatasetSink(self, name) for name in self._coordinate_sink_names
             ]
             runner.run(self.fragment, self.spec, self._coordinate_sinks)
             self._set_completed()
@@ -358,11 +440,17 @@ class TopLevelRunner(HasEnvironment):
         return self._make_coordinate_dict(), self._make_value_dict()
 
     def _make_coordinate_dict(self):
-        return OrderedDict(((a.param_schema["fqn"], a.path), s.get_all())
-                           for a, s in zip(self.spec.axes, self._coordinate_sinks))
+        # Cached so that analyze() immediately following run() does not copy out every
+        # coordinate sink a second time; reset when a new scan is started.
+        if self._coordinate_dict_cache is None:
+            self._coordinate_dict_cache = {
+                (a.param_schema["fqn"], a.path): s.get_all()
+                for a, s in zip(self.spec.axes, self._coordinate_sinks)
+            }
+        return self._coordinate_dict_cache
 
     def _make_value_dict(self):
-        return {c: s.get_all() for c, s in self._scan_result_sinks.items()}
+        return {c: s.get_all() for c, s in self._scan_result_pairs}
 
     def analyze(self):
         if self._coordinate_sinks is None:
@@ -382,17 +470,26 @@ class TopLevelRunner(HasEnvironment):
         if annotations:
             # Replace existing (online-fit) annotations if any analysis produced custom
             # ones. This could be made configurable in the future.
-            self.set_dataset(self.dataset_prefix + "annotations",
-                             dump_json(annotations),
-                             broadcast=True)
+            serialized = dump_json(annotations)
+            self.set_dataset(self._ds_annotations, serialized, broadcast=True)
+            # Keep the dedup map in sync so the next metadata broadcast (e.g. when this
+            # instance is run again) restores the default annotations instead of
+            # skipping them as seemingly unchanged.
+            self._last_pushed["annotations"] = serialized
 
         return {
             name: channel.sink.get_last()
             for name, channel in self._analysis_results.items()
         }
 
+    #: Minimum time between point_phase dataset broadcasts; at high point rates, a
+    #: per-point RPC to the master would dominate, and ~10 Hz is plenty for applets.
+    POINT_PHASE_PUSH_INTERVAL = 0.1
+
     def _run_continuous(self):
-        self._point_phase = False
+        self._point_counter = 0
+        self._last_point_phase_push = 0.0
+        self._point_phase_dirty = False
         # TODO: Unify with _FragmentRunner.
         self.num_current_transitory_errors = 0
         self.num_current_underflows = 0
@@ -404,7 +501,7 @@ class TopLevelRunner(HasEnvironment):
                 self.fragment.recompute_param_defaults()
                 try:
                     self.fragment.host_setup()
-                    if is_kernel(self.fragment.run_once):
+                    if self._run_once_is_kernel:
                         done = self._run_continuous_kernel()
                         self.core.comm.close()
                         if done:
@@ -416,6 +513,7 @@ class TopLevelRunner(HasEnvironment):
                     self.fragment.host_cleanup()
                 self.scheduler.pause()
         finally:
+            self._flush_point_phase()
             self._set_completed()
 
     @kernel
@@ -426,11 +524,17 @@ class TopLevelRunner(HasEnvironment):
     @portable
     def _continuous_loop(self):
         # TODO: Unify with _FragmentRunner.
+        # Bind loop invariants to locals so neither the interpreter nor the ARTIQ
+        # compiler re-resolves the attributes on every iteration. (The error counters
+        # remain instance fields, as they need to survive kernel restarts.)
+        fragment = self.fragment
+        max_underflow_retries = self.max_rtio_underflow_retries
+        max_transitory_retries = self.max_transitory_error_retries
         try:
             while not self.scheduler.check_pause():
                 try:
-                    self.fragment.device_setup()
-                    self.fragment.run_once()
+                    fragment.device_setup()
+                    fragment.run_once()
                     self._finish_continuous_point()
                     if not self._continue_running:
                         return True
@@ -441,30 +545,28 @@ class TopLevelRunner(HasEnvironment):
                     self.num_current_underflows = 0
                 except RTIOUnderflow:
                     self.num_current_underflows += 1
-                    if self.num_current_underflows > self.max_rtio_underflow_retries:
+                    if self.num_current_underflows > max_underflow_retries:
                         raise
                     print("Ignoring RTIOUnderflow (", self.num_current_underflows, "/",
-                          self.max_rtio_underflow_retries, ")")
+                          max_underflow_retries, ")")
                 except RestartKernelTransitoryError:
                     self.num_current_transitory_errors += 1
-                    if (self.num_current_transitory_errors >
-                            self.max_transitory_error_retries):
+                    if (self.num_current_transitory_errors > max_transitory_retries):
                         raise
                     print("Caught transitory error (",
                           self.num_current_transitory_errors, "/",
-                          self.max_transitory_error_retries, "), restarting kernel")
+                          max_transitory_retries, "), restarting kernel")
                     return False
                 except TransitoryError:
                     self.num_current_transitory_errors += 1
-                    if (self.num_current_transitory_errors >
-                            self.max_transitory_error_retries):
+                    if (self.num_current_transitory_errors > max_transitory_retries):
                         raise
                     print("Caught transitory error (",
                           self.num_current_transitory_errors, "/",
-                          self.max_transitory_error_retries, "), retrying")
+                          max_transitory_retries, "), retrying")
             return False
         finally:
-            self.fragment.device_cleanup()
+            fragment.device_cleanup()
         assert False, "Execution never reaches here, return is just to pacify compiler."
         return True
 
@@ -473,41 +575,59 @@ class TopLevelRunner(HasEnvironment):
         if self._is_time_series:
             self._timestamp_sink.push(time.monotonic() - self._time_series_start)
         else:
-            self._point_phase = not self._point_phase
-            self.set_dataset(self.dataset_prefix + "point_phase",
-                             self._point_phase,
+            self._point_counter += 1
+            now = time.monotonic()
+            if now - self._last_point_phase_push > self.POINT_PHASE_PUSH_INTERVAL:
+                self._last_point_phase_push = now
+                self._point_phase_dirty = False
+                self.set_dataset(self._ds_point_phase,
+                                 bool(self._point_counter & 1),
+                                 broadcast=True)
+            else:
+                self._point_phase_dirty = True
+
+    def _flush_point_phase(self):
+        # Push any phase update suppressed by the rate limit once the loop has exited;
+        # observers (e.g. the plot SubscriberSinglePointModel) only display a point on
+        # a point_phase change, so without this, points finished during the last
+        # throttle interval would never be shown.
+        if self._point_phase_dirty:
+            self._point_phase_dirty = False
+            self.set_dataset(self._ds_point_phase,
+                             bool(self._point_counter & 1),
                              broadcast=True)
 
     def _set_completed(self):
-        self.set_dataset(self.dataset_prefix + "completed", True, broadcast=True)
+        self.set_dataset(self._ds_completed, True, broadcast=True)
+        # Keep the dedup map in sync so a subsequent metadata rebroadcast correctly
+        # resets the flag to False again.
+        self._last_pushed["completed"] = True
 
     def _broadcast_metadata(self):
-        def push(name, value):
-            self.set_dataset(self.dataset_prefix + name, value, broadcast=True)
-
-        push(SCHEMA_REVISION_KEY, SCHEMA_REVISION)
+        items = {SCHEMA_REVISION_KEY: SCHEMA_REVISION}
 
         source_prefix = self.get_dataset("system_id", default="rid")
-        push("source_id", f"{source_prefix}_{self.scheduler.rid}")
+        items["source_id"] = f"{source_prefix}_{self.scheduler.rid}"
 
-        push("completed", False)
+        items["completed"] = False
 
-        self._scan_desc = describe_scan(self.spec, self.fragment,
-                                        self._short_child_channel_names)
-        self._scan_desc.update(
-            describe_analyses(self._analyses, self._annotation_context))
-        self._scan_desc["analysis_results"] = {
-            name: channel.describe()
-            for name, channel in self._analysis_results.items()
-        }
+        items.update(self._serialized_scan_desc)
 
-        for name, value in self._scan_desc.items():
-            # Flatten arrays/dictionaries to JSON strings for HDF5 compatibility.
-            ds_value = to_metadata_broadcast_type(value)
-            if ds_value is None:
-                push(name, dump_json(value))
-            else:
-                push(name, ds_value)
+        self._batch_broadcast(items)
+
+    def _batch_broadcast(self, items: dict[str, Any]) -> None:
+        """Broadcast the given dataset values (keys relative to the dataset prefix)
+        back-to-back, without any serialisation work interleaved between the individual
+        ``set_dataset()`` calls, to keep the master connection pipeline full.
+
+        Entries whose value is unchanged from the previous broadcast are skipped, so
+        rebroadcasts (e.g. on resuming from a pause) do not cause the master to rewrite
+        – and observers to re-process – identical datasets."""
+        for name, value in items.items():
+            if self._last_pushed.get(name, None) == value:
+                continue
+            self._last_pushed[name] = value
+            self.set_dataset(self.dataset_prefix + name, value, broadcast=True)
 
     def create_applet(self, title: str, group: str = "ndscan"):
         cmd = [
@@ -519,6 +639,14 @@ class TopLevelRunner(HasEnvironment):
 
 
 def _shorten_result_channel_names(full_names: Iterable[str]) -> dict[str, str]:
+    return _shorten_result_channel_names_cached(frozenset(full_names))
+
+
+@functools.lru_cache(maxsize=None)
+def _shorten_result_channel_names_cached(full_names: frozenset[str]) -> dict[str, str]:
+    # The shortening only depends on the set of names, so memoise the result –
+    # repeatedly preparing the same fragment class (e.g. in servo/tuning loops) skips
+    # the suffix disambiguation entirely.
     return shorten_to_unambiguous_suffixes(full_names,
                                            lambda fqn, n: "/".join(fqn.split("/")[-n:]))
 
@@ -551,6 +679,10 @@ def make_fragment_scan_exp(
     # Take on the name of the fragment class to keep result file names informative.
     FragmentScanShim.__name__ = fragment_class.__name__
 
+    # The fragment class is fixed here, so resolve the pretty name (which involves
+    # docstring parsing) once at factory time rather than on every run().
+    FragmentScanShim._pretty_name = get_class_pretty_name(fragment_class)
+
     # Use the fragment class docstring to display in the experiment explorer UI.
     FragmentScanShim.__doc__ = fragment_class.__doc__
 
@@ -568,6 +700,7 @@ class _FragmentRunner(HasEnvironment):
         self.max_transitory_error_retries = max_transitory_error_retries
         self.num_underflows_caught = 0
         self.num_transitory_errors_caught = 0
+        self._run_once_is_kernel = is_kernel(fragment.run_once)
 
     def run(self) -> bool:
         """Execute device_setup()/run_once(), retrying if nececssary.
@@ -576,7 +709,7 @@ class _FragmentRunner(HasEnvironment):
             again (RestartKernelTransitoryError).
         """
         # TODO: Unify with FragmentScanExperiment._run_continuous().
-        if is_kernel(self.fragment.run_once):
+        if self._run_once_is_kernel:
             self.setattr_device("core")
             return self._run_on_kernel()
         else:
@@ -694,6 +827,9 @@ def create_and_run_fragment_once(env: HasEnvironment,
         fragment_class(env, [], *args, **kwargs),
         max_rtio_underflow_retries=max_rtio_underflow_retries,
         max_transitory_error_retries=max_transitory_error_retries)
-    shortened_names = _shorten_result_channel_names(channel.path
-                                                    for channel in results.keys())
-    return {shortened_names[channel.path]: value for channel, value in results.items()}
+    paths = [channel.path for channel in results]
+    shortened_names = _shorten_result_channel_names(paths)
+    return {
+        shortened_names[path]: value
+        for path, value in zip(paths, results.values())
+    }
@@ -71,6 +71,11 @@ class Fragment(HasEnvironment):
         #: Maps full path of own result channels to ResultChannel instances.
         self._result_channels = {}
 
+        #: Cached result of :meth:`_collect_result_channels`, including subfragments;
+        #: populated on first use, which is only ever after the tree has finished
+        #: building (and can thus no longer change).
+        self._collected_result_channels: dict[str, ResultChannel] | None = None
+
         #: Subfragments detached from the normal fragment execution (setup/cleanup,
         #: result channels; e.g. for subscans).
         self._detached_subfragments = set()
@@ -731,11 +736,14 @@ class Fragment(HasEnvironment):
         return "/".join(self._fragment_path)
 
     def _collect_result_channels(self, channels: dict[str, ResultChannel]) -> None:
-        channels.update(self._result_channels)
-        for s in self._subfragments:
-            if s in self._detached_subfragments:
-                continue
-            s._collect_result_channels(channels)
+        if self._collected_result_channels is None:
+            collected = dict(self._result_channels)
+            for s in self._subfragments:
+                if s in self._detached_subfragments:
+                    continue
+                s._collect_result_channels(collected)
+            self._collected_result_channels = collected
+        channels.update(self._collected_result_channels)
 
     def _get_dataset_or_set_default(self, key, default=None) -> Any:
         try:
@@ -3,16 +3,50 @@
 This includes, for instance, fit curves and lines indicating fit results.
 """
 
+import functools
 import logging
+import math
 import numpy
 from oitg import uncertainty_to_string
 import pyqtgraph
-from .._qt import QtCore
+from .._qt import QtCore, QtGui
 from ..utils import FIT_OBJECTS
 from .model import AnnotationDataSource
 
 logger = logging.getLogger(__name__)
 
+#: Whether to evaluate computed fit curves in single precision. The curves are only a
+#: display aid sampled at pixel resolution, so this halves the memory traffic through
+#: the fit function evaluation and into pyqtgraph without visible impact – but only as
+#: long as the x coordinates are small compared to the float32 mantissa; e.g. a
+#: Hz-resolution scan around hundreds of MHz quantises visibly. Thus off by default.
+USE_FP32_PLOT = False
+
+#: Number of fit curve samples per screen pixel for slowly varying models, where
+#: half-pixel sampling is visually indistinguishable from 1:1 (the line renderer
+#: interpolates between samples) at half the evaluation cost.
+DEFAULT_FIT_SAMPLES_PER_PIXEL = 0.5
+
+#: Per-function sample density overrides. The oscillatory models routinely produce
+#: fringes spanning only a few pixels per period (e.g. Ramsey/Rabi scans), where
+#: anything below full pixel density visibly aliases.
+FIT_SAMPLES_PER_PIXEL = {
+    name: 1.0
+    for name in ("cos", "decaying_sinusoid", "detuned_square_pulse", "rabi_flop",
+                 "sinusoid")
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _make_pen(color: str, style: QtCore.Qt.PenStyle) -> QtGui.QPen:
+    """Return a shared cosmetic pen for the given colour/style combination.
+
+    Dashboards easily accumulate dozens of annotation lines using the same handful of
+    colours; sharing the pens avoids re-allocating them per item. (QPen is a value
+    type as far as Qt's paint path is concerned, so sharing is safe.)
+    """
+    return pyqtgraph.mkPen(color, style=style, cosmetic=True)
+
 
 class AnnotationItem(QtCore.QObject):
     def remove(self) -> None:
@@ -45,60 +79,140 @@ class ComputedCurveItem(AnnotationItem):
                  view_box, curve_item, x_limits: tuple[float | None, float | None]):
         super().__init__(view_box)  # Automatically disconnect when view_box is deleted.
         self._function = FIT_OBJECTS[function_name].fitting_function
+        self._samples_per_pixel = FIT_SAMPLES_PER_PIXEL.get(
+            function_name, DEFAULT_FIT_SAMPLES_PER_PIXEL)
         self._data_sources = data_sources
+        # The set of parameter sources is fixed, so keep name/source tuples for cheap
+        # ordered iteration without rebuilding dict views per redraw.
+        self._source_names = tuple(data_sources.keys())
+        self._source_list = tuple(data_sources.values())
         self._view_box = view_box
         self._curve_item = curve_item
         self._x_limits = x_limits
         self._curve_item_added = False
 
-        self.redraw_limiter = pyqtgraph.SignalProxy(self._view_box.sigXRangeChanged,
-                                                    slot=self._redraw,
-                                                    rateLimit=30)
+        #: Last function evaluation, as a tuple
+        #: ((param_values, num_points), xs, ys, x_lims), to avoid re-evaluating the
+        #: fit function on pure pan interactions.
+        self._cache = None
+
+        #: Persistent x grid buffer (plus the plain 0..n-1 ramp it is computed from),
+        #: refilled in place as long as the pixel width does not change.
+        self._xs_buf = None
+        self._xs_ramp = None
 
-        for source in self._data_sources.values():
-            source.changed.connect(self.redraw_limiter.signalReceived)
+        #: Whether a redraw is already pending; further triggers are coalesced into it.
+        self._redraw_scheduled = False
 
-        self.redraw_limiter.signalReceived()
+        # Keep one bound-method object around and connect/disconnect exactly that, so
+        # PyQt matches the slot by identity instead of searching the connection list.
+        self._redraw_slot = self._schedule_redraw
+        self._view_box.sigXRangeChanged.connect(self._redraw_slot)
+        for source in self._source_list:
+            source.changed.connect(self._redraw_slot)
+
+        self._schedule_redraw()
 
     def remove(self):
-        for source in self._data_sources.values():
-            source.changed.disconnect(self.redraw_limiter.signalReceived)
+        self._view_box.sigXRangeChanged.disconnect(self._redraw_slot)
+        for source in self._source_list:
+            source.changed.disconnect(self._redraw_slot)
         if self._curve_item_added:
             self._view_box.removeItem(self._curve_item)
 
+    def _schedule_redraw(self, *args):
+        # Coalesce bursts of updates (view range changes, several parameter sources
+        # changing in one tick) into at most one evaluation per ~frame, instead of
+        # re-entering _redraw() once per signal.
+        if self._redraw_scheduled:
+            return
+        self._redraw_scheduled = True
+        QtCore.QTimer.singleShot(33, self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_scheduled = False
+        self._redraw()
+
     def _redraw(self, *args):
-        params = {}
-        for name, source in self._data_sources.items():
+        view_box = self._view_box
+        width = view_box.width()
+        if width < 2:
+            # Not laid out yet (or degenerate); no sensible grid to evaluate over. A
+            # redraw will be triggered again once the view gets its actual size.
+            return
+
+        values = []
+        for source in self._source_list:
             value = source.get()
             if value is None:
                 # Don't have enough data yet.
                 # TODO: Use exception instead of None for cleanliness?
                 return
-            params[name] = value
+            values.append(value)
 
         if not self._curve_item_added:
             # Ignore bounding box of newly added line for auto-range computation, as we
             # choose its range based on the visible area.
-            self._view_box.addItem(self._curve_item, ignoreBounds=True)
+            view_box.addItem(self._curve_item, ignoreBounds=True)
             self._curve_item_added = True
 
         # Choose horizontal range based on currently visible area (extending slightly
-        # beyond it to ensure a visually smooth border).
-        x_range, _ = self._view_box.state["viewRange"]
-        ext = (x_range[1] - x_range[0]) / 10
-        x_lims = [x_range[0] - ext, x_range[1] + ext]
+        # beyond it to ensure a visually smooth border). state["viewRange"] is the
+        # cached list itself; viewRange() would copy it.
+        x0, x1 = view_box.state["viewRange"][0]
+        ext = (x1 - x0) * 0.1
+        x_lims = [x0 - ext, x1 + ext]
 
         if self._x_limits[0] is not None:
             x_lims[0] = max(x_lims[0], self._x_limits[0])
         if self._x_limits[1] is not None:
             x_lims[1] = min(x_lims[1], self._x_limits[1])
 
-        # Choose number of points based on width of plot on screen (in pixels).
-        fn_xs = numpy.linspace(*x_lims, int(self._view_box.width()))
+        # Choose number of points based on width of plot on screen (in pixels) and the
+        # model's sample density, with a floor so tiny/collapsed views still get a
+        # usable curve.
+        num_points = max(64, int(width * self._samples_per_pixel))
+
+        fn_xs = self._make_xs(x_lims[0], x_lims[1], num_points)
+
+        # If neither the parameters nor the point density have changed and the
+        # previously computed curve still covers the new x range (e.g. during panning,
+        # as the drawn range extends beyond the visible area), interpolate from the
+        # cached evaluation instead of invoking the fit function again. Only do so if
+        # the cached grid is not much coarser than the requested one, so repeated
+        # zooming in does not degrade the curve.
+        key = (tuple(values), num_points)
+        if self._cache is not None:
+            cached_key, cached_xs, cached_ys, cached_lims = self._cache
+            covered = (x_lims[0] >= cached_lims[0] and x_lims[1] <= cached_lims[1]
+                       and x_lims[1] - x_lims[0] >=
+                       (cached_lims[1] - cached_lims[0]) / 2)
+            if key == cached_key and covered:
+                self._curve_item.setData(fn_xs, numpy.interp(fn_xs, cached_xs,
+                                                             cached_ys))
+                return
 
-        fn_ys = self._function(fn_xs, params)
+        # The params dict (as consumed by the oitg fitting functions) is only built on
+        # the evaluation path, not for cache hits.
+        fn_ys = self._function(fn_xs, dict(zip(self._source_names, values)))
+        # Snapshot the x grid, as the underlying buffer is refilled in place on
+        # subsequent redraws.
+        self._cache = (key, fn_xs.copy(), fn_ys, tuple(x_lims))
         self._curve_item.setData(fn_xs, fn_ys)
 
+    def _make_xs(self, x0: float, x1: float, num_points: int) -> numpy.ndarray:
+        # numpy.linspace() allocates a fresh array per call, which adds up during
+        # sustained interactive redraws; fill a persistent buffer in place instead as
+        # long as the pixel width stays the same.
+        if self._xs_buf is None or self._xs_buf.size != num_points:
+            dtype = numpy.float32 if USE_FP32_PLOT else numpy.float64
+            self._xs_buf = numpy.empty(num_points, dtype=dtype)
+            self._xs_ramp = numpy.arange(num_points, dtype=dtype)
+        step = (x1 - x0) / (num_points - 1) if num_points > 1 else 0.0
+        numpy.multiply(self._xs_ramp, step, out=self._xs_buf)
+        self._xs_buf += x0
+        return self._xs_buf
+
 
 class CurveItem(AnnotationItem):
     """Shows a curve between the given x/y coordinate pairs."""
@@ -107,18 +221,20 @@ class CurveItem(AnnotationItem):
         super().__init__(view_box)  # Automatically disconnect when view_box is deleted.
         self._x_source = x_source
         self._y_source = y_source
+        self._sources = (x_source, y_source)
         self._view_box = view_box
         self._curve_item = curve_item
         self._curve_item_added = False
 
-        for source in [self._x_source, self._y_source]:
-            source.changed.connect(self._redraw)
+        self._redraw_slot = self._redraw
+        for source in self._sources:
+            source.changed.connect(self._redraw_slot)
 
         self._redraw()
 
     def remove(self):
-        for source in [self._x_source, self._y_source]:
-            source.changed.disconnect(self._redraw)
+        for source in self._sources:
+            source.changed.disconnect(self._redraw_slot)
         if self._curve_item_added:
             self._view_box.removeItem(self._curve_item)
 
@@ -157,56 +273,59 @@ class VLineItem(AnnotationItem):
         self._added_to_plot = False
         self._show_label = show_label
 
-        # Position label within initial view range.
-        ypos_label = (view_box.height() - 7) / view_box.height()
+        #: Last (position, uncertainty) drawn, to skip label formatting and line
+        #: updates when retriggered without the values actually having changed.
+        self._last_drawn = None
 
-        self._left_line = pyqtgraph.InfiniteLine(movable=False,
-                                                 angle=90,
-                                                 pen={
-                                                     "color": base_color,
-                                                     "style": QtCore.Qt.PenStyle.DotLine
-                                                 })
-        self._center_line = pyqtgraph.InfiniteLine(movable=False,
-                                                   angle=90,
-                                                   label="",
-                                                   labelOpts={
-                                                       "position": ypos_label,
-                                                       "color": base_color,
-                                                       "movable": True
-                                                   },
-                                                   pen={
-                                                       "color": base_color,
-                                                       "style":
-                                                       QtCore.Qt.PenStyle.SolidLine
-                                                   })
-        self._right_line = pyqtgraph.InfiniteLine(movable=False,
-                                                  angle=90,
-                                                  pen={
-                                                      "color": base_color,
-                                                      "style":
-                                                      QtCore.Qt.PenStyle.DotLine
-                                                  })
-
-        self._position_source.changed.connect(self._redraw)
+        self._base_color = base_color
+
+        self._redraw_slot = self._redraw
+        self._position_source.changed.connect(self._redraw_slot)
         if self._uncertainty_source:
-            self._uncertainty_source.changed.connect(self._redraw)
+            self._uncertainty_source.changed.connect(self._redraw_slot)
 
         self._redraw()
 
     def remove(self):
-        self._position_source.changed.disconnect(self._redraw)
+        self._position_source.changed.disconnect(self._redraw_slot)
         if self._uncertainty_source:
-            self._uncertainty_source.changed.disconnect(self._redraw)
+            self._uncertainty_source.changed.disconnect(self._redraw_slot)
         if self._added_to_plot:
             for line in (self._left_line, self._center_line, self._right_line):
                 self._view_box.removeItem(line)
 
+    def _build_lines(self):
+        base_color = self._base_color
+
+        # Position label within current view range.
+        height = self._view_box.height()
+        ypos_label = (height - 7) / height
+
+        dot_pen = _make_pen(base_color, QtCore.Qt.PenStyle.DotLine)
+        solid_pen = _make_pen(base_color, QtCore.Qt.PenStyle.SolidLine)
+
+        self._left_line = pyqtgraph.InfiniteLine(movable=False, angle=90, pen=dot_pen)
+        self._center_line = pyqtgraph.InfiniteLine(movable=False,
+                                                   angle=90,
+                                                   label="",
+                                                   labelOpts={
+                                                       "position": ypos_label,
+                                                       "color": base_color,
+                                                       "movable": True
+                                                   },
+                                                   pen=solid_pen)
+        self._right_line = pyqtgraph.InfiniteLine(movable=False, angle=90, pen=dot_pen)
+
     def _redraw(self):
         x = self._position_source.get()
         if x is None:
             return
 
         if not self._added_to_plot:
+            # The line items are only constructed once there actually is a position to
+            # show – annotations whose sources never deliver data (e.g. fits that do
+            # not converge) then cost no QObject/pen setup at all.
+            self._build_lines()
             self._view_box.addItem(self._left_line, ignoreBounds=True)
             self._view_box.addItem(self._center_line, ignoreBounds=True)
             self._view_box.addItem(self._right_line, ignoreBounds=True)
@@ -215,19 +334,32 @@ class VLineItem(AnnotationItem):
         delta_x = None
         if self._uncertainty_source:
             delta_x = self._uncertainty_source.get()
-
-        if delta_x is None or numpy.isnan(delta_x) or delta_x == 0.0:
+        if delta_x is None or not math.isfinite(delta_x):
             # If the covariance extraction failed, just don't display the
             # confidence interval at all.
             delta_x = 0.0
-            label = str(x * self._x_data_to_display_scale)
+
+        if (x, delta_x) == self._last_drawn:
+            # Unchanged values (e.g. retriggered by unrelated source fan-out); skip
+            # the label formatting and the scene-dirtying line updates.
+            return
+        self._last_drawn = (x, delta_x)
+
+        scale = self._x_data_to_display_scale
+        if delta_x == 0.0:
+            label = str(x * scale)
         else:
-            label = uncertainty_to_string(x * self._x_data_to_display_scale,
-                                          delta_x * self._x_data_to_display_scale)
+            label = uncertainty_to_string(x * scale, delta_x * scale)
 
         if self._show_label:
             self._center_line.label.setFormat(label + self._x_unit_suffix)
 
-        self._left_line.setPos(x - delta_x)
+        # Without a confidence interval, the side lines would just coincide with the
+        # centre line; hide them so they do not triple the paint/scene update traffic.
+        show_interval = delta_x != 0.0
+        self._left_line.setVisible(show_interval)
+        self._right_line.setVisible(show_interval)
+        if show_interval:
+            self._left_line.setPos(x - delta_x)
+            self._right_line.setPos(x + delta_x)
         self._center_line.setPos(x)
-        self._right_line.setPos(x + delta_x)
@@ -7,13 +7,15 @@ from ndscan.experiment import *
 from ndscan.experiment.utils import is_kernel
 from ndscan.utils import PARAMS_ARG_KEY, SCHEMA_REVISION, SCHEMA_REVISION_KEY
 from sipyco import pyon
-from fixtures import (AddOneFragment, ReboundAddOneFragment, TransitoryErrorFragment,
+from fixtures import (AddOneFragment, AddOneCustomAnalysisFragment,
+                      ReboundAddOneFragment, TransitoryErrorFragment,
                       MultiPointTransitoryErrorFragment, RequestTerminationFragment,
                       AddOneAggregate, TrivialKernelAggregate, TwoAnalysisAggregate,
                       ReadParamDefault, MultiReboundAddOneFragment)
 from mock_environment import HasEnvironmentCase
 
 ScanAddOneExp = make_fragment_scan_exp(AddOneFragment)
+ScanAddOneCustomAnalysisExp = make_fragment_scan_exp(AddOneCustomAnalysisFragment)
 ScanReboundAddOneExp = make_fragment_scan_exp(ReboundAddOneFragment)
 ScanTwoAnalysisAggregateExp = make_fragment_scan_exp(TwoAnalysisAggregate)
 ScanReadParamDefaultExp = make_fragment_scan_exp(ReadParamDefault)
@@ -92,6 +94,26 @@ class FragmentScanExpCase(HasEnvironmentCase):
         self.assertEqual(d("fragment_fqn"), "fixtures.AddOneFragment")
         self.assertEqual(d("source_id"), "system_0")
 
+    def test_run_repeat_scan_flushes_point_phase(self):
+        exp = self.create(ScanAddOneExp)
+        exp.args._params["scan"]["no_axes_mode"] = "repeat"
+
+        # Terminate after four points have been run.
+        self.scheduler.num_check_pause_calls_until_termination = 5
+
+        exp.prepare()
+        exp.run()
+
+        def d(key):
+            return self.dataset_db.get("ndscan.rid_0." + key)
+
+        self.assertEqual(d("completed"), True)
+        self.assertEqual(d("point.result"), 1.0)
+        # point_phase pushes are rate-limited during the scan, but once it stops, the
+        # dataset must always reflect the last completed point (here the fourth, i.e.
+        # even parity), as observers only display a point on a phase change.
+        self.assertEqual(d("point_phase"), False)
+
     def test_run_time_series_scan(self):
         # Make fragment that fails device_setup() as many times as allowed to test
         # whether counters are correctly reset between points in time series scan.
@@ -288,6 +310,36 @@ class FragmentScanExpCase(HasEnvironmentCase):
 
         return exp
 
+    def test_rerun_restores_default_annotations(self):
+        exp = self.create(ScanAddOneCustomAnalysisExp)
+        exp.args._params["scan"]["axes"].append({
+            "type": "linear",
+            "range": {
+                "start": 0,
+                "stop": 2,
+                "num_points": 3,
+                "randomise_order": False
+            },
+            "fqn": "fixtures.AddOneCustomAnalysisFragment.value",
+            "path": "*"
+        })
+        exp.prepare()
+        exp.run()
+
+        def d(key):
+            return self.dataset_db.get("ndscan.rid_0." + key)
+
+        default_annotations = d("annotations")
+        exp.analyze()
+        custom_annotations = d("annotations")
+        self.assertNotEqual(custom_annotations, default_annotations)
+
+        # Running the same instance again must replace the previous run's custom
+        # analyze() annotations with the defaults, even though the metadata broadcast
+        # skips unchanged datasets.
+        exp.run()
+        self.assertEqual(d("annotations"), default_annotations)
+
     def test_aggregate_scan(self):
         exp = self.create(ScanTwoAnalysisAggregateExp)
         exp.args._params["scan"]["axes"].append({